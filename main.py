@@ -1,22 +1,104 @@
 # FastAPI Backend for YouTube RAG Blog Generator
-# pip install fastapi uvicorn youtube-transcript-api llama-index faiss-cpu openai python-multipart
+# pip install fastapi uvicorn[standard] youtube-transcript-api llama-index llama-index-vector-stores-faiss faiss-cpu openai tiktoken python-multipart
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
 from pydantic import BaseModel
-from youtube_transcript_api import YouTubeTranscriptApi
-from llama_index.core import Settings, VectorStoreIndex, SimpleDirectoryReader
+import youtube_transcript_api
+from youtube_transcript_api import (
+    YouTubeTranscriptApi,
+    CouldNotRetrieveTranscript,
+    InvalidVideoId,
+    NoTranscriptFound,
+    TranscriptsDisabled,
+    VideoUnavailable,
+)
+from llama_index.core import Settings, VectorStoreIndex, SummaryIndex, Document, StorageContext, load_index_from_storage
 from llama_index.llms.openai import OpenAI
 from llama_index.embeddings.openai import OpenAIEmbedding
 from llama_index.core.node_parser import SentenceSplitter
-import tempfile
+from llama_index.vector_stores.faiss import FaissVectorStore
+import faiss
+import asyncio
+import functools
 import os
+import shutil
+import tempfile
 import re
+import hashlib
+import logging
 import openai
-from typing import Optional
+import tiktoken
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+from collections import OrderedDict
 import sys
 sys.stdout.reconfigure(encoding='utf-8')
 
+logger = logging.getLogger(__name__)
+
+# On-disk cache for transcripts and vector indexes, keyed by video ID
+CACHE_DIR = os.path.join(".", ".cache")
+TRANSCRIPT_CACHE_DIR = os.path.join(CACHE_DIR, "transcripts")
+INDEX_CACHE_DIR = os.path.join(CACHE_DIR, "index")
+RESPONSE_CACHE_DIR = os.path.join(CACHE_DIR, "responses")
+
+# YouTube throttling errors: TooManyRequests before 1.0, RequestBlocked/IpBlocked from 1.0
+YOUTUBE_THROTTLE_ERRORS = tuple(
+    getattr(youtube_transcript_api, name)
+    for name in ("TooManyRequests", "RequestBlocked", "IpBlocked")
+    if hasattr(youtube_transcript_api, name)
+)
+
+# OpenAI chat model used for generation
+LLM_MODEL = "gpt-3.5-turbo"
+
+# Embedding dimension of OpenAI's text-embedding-ada-002
+EMBED_DIM = 1536
+
+# Chunks sent per OpenAI embeddings request (API limit is 2048 inputs)
+EMBED_BATCH_SIZE = 100
+
+# Retrieved chunks per query; keeps context around 4k tokens with 1024-token chunks
+SIMILARITY_TOP_K = 4
+
+# Transcripts at or below this many tokens are sent to the LLM whole instead of via RAG
+FULL_CONTEXT_TOKEN_LIMIT = 4000
+
+# Transcript chunking is identical for every request, so share one splitter
+_SPLITTER = SentenceSplitter(chunk_size=1024, chunk_overlap=0)
+Settings.node_parser = _SPLITTER
+
+# Distinct API keys whose clients are kept open at once
+MAX_CACHED_CLIENTS = 32
+
+# OpenAI LLM and embedding clients, keyed by API key, least recently used first
+_CLIENTS: "OrderedDict[str, Tuple[OpenAI, OpenAIEmbedding]]" = OrderedDict()
+
+# Number of in-flight requests using each client pair, keyed by id() of the pair
+_CLIENT_LEASES: Dict[int, int] = {}
+
+# Prompts shared by the summary and blog endpoints
+SUMMARY_PROMPT = (
+    "Provide a comprehensive summary of this content in 3-4 paragraphs, "
+    "highlighting the main topics, key insights, and important takeaways."
+)
+
+BLOG_PROMPT = """
+Write a comprehensive, engaging blog post based on this content. 
+Structure it with:
+1. An engaging title and introduction
+2. Main sections with clear headings
+3. Key insights and explanations
+4. Practical examples or applications
+5. A compelling conclusion
+
+Make it informative, well-structured, and engaging for readers.
+Use HTML formatting for headings (<h3>) and paragraphs (<p>).
+"""
+
 # FastAPI app initialization
 app = FastAPI(title="YouTube RAG Blog Generator API", version="1.0.0")
 
@@ -58,26 +140,327 @@ class ProcessResponse(BaseModel):
     success: bool
     message: str
 
+# Hosts serving watch and embed URLs
+YOUTUBE_HOSTS = {"youtube.com", "www.youtube.com", "m.youtube.com", "music.youtube.com"}
+
+# YouTube video IDs are 11 URL-safe base64 characters
+VIDEO_ID_FORMAT = re.compile(r'[A-Za-z0-9_-]{11}')
+
+# Longest video URL accepted; anything longer is rejected before parsing
+MAX_VIDEO_URL_LENGTH = 2048
+
 # Utility functions
 def extract_video_id(url: str) -> Optional[str]:
     """Extract YouTube video ID from URL"""
-    patterns = [
-        r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([^&\n?#]+)',
-        r'youtube\.com\/watch\?.*v=([^&\n?#]+)'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    return None
-
-def setup_llama_index(api_key: str):
-    """Setup LlamaIndex with OpenAI credentials"""
-    openai.api_key = api_key
-    Settings.llm = OpenAI(model="gpt-3.5-turbo", api_key=api_key)
-    Settings.embed_model = OpenAIEmbedding(api_key=api_key)
-    Settings.node_parser = SentenceSplitter(chunk_size=1024, chunk_overlap=200)
+    url = url.strip()
+    if len(url) > MAX_VIDEO_URL_LENGTH:
+        return None
+
+    try:
+        parsed = urlparse(url)
+        if not parsed.netloc:
+            # Scheme-less input such as "youtube.com/watch?v=..."
+            parsed = urlparse(f"https://{url}")
+        host = parsed.hostname
+    except ValueError:
+        # Malformed input such as an unterminated IPv6 host
+        return None
+
+    if host == "youtu.be":
+        video_id = parsed.path[1:].split("/")[0]
+    elif host in YOUTUBE_HOSTS:
+        if parsed.path == "/watch":
+            video_id = parse_qs(parsed.query).get("v", [""])[0]
+        elif parsed.path.startswith("/embed/"):
+            video_id = parsed.path.split("/")[2]
+        else:
+            return None
+    else:
+        # Unknown or missing host
+        return None
+
+    # The ID ends up in cache paths, so only accept well-formed IDs
+    return video_id if VIDEO_ID_FORMAT.fullmatch(video_id) else None
+
+def _require_video_id(url: str) -> str:
+    """Extract the video ID from a request URL, rejecting invalid URLs with a 400"""
+    video_id = extract_video_id(url)
+    if not video_id:
+        raise HTTPException(status_code=400, detail="Invalid YouTube URL")
+    return video_id
+
+async def _acquire_clients(api_key: str) -> Tuple[OpenAI, OpenAIEmbedding]:
+    """Lease the OpenAI LLM and embedding clients for an API key"""
+    # Reuse clients (and their connection pools) across requests with the same key.
+    # Callers pass them explicitly instead of setting the global Settings, since
+    # concurrent requests may carry different keys.
+    clients = _CLIENTS.pop(api_key, None)
+    if clients is None:
+        clients = (
+            OpenAI(model=LLM_MODEL, api_key=api_key),
+            # Embed all chunks of a typical transcript in a single request
+            OpenAIEmbedding(api_key=api_key, embed_batch_size=EMBED_BATCH_SIZE),
+        )
+    _CLIENTS[api_key] = clients
+    _CLIENT_LEASES[id(clients)] = _CLIENT_LEASES.get(id(clients), 0) + 1
+
+    # Evict least recently used keys; clients still in use are closed on release
+    while len(_CLIENTS) > MAX_CACHED_CLIENTS:
+        _, evicted = _CLIENTS.popitem(last=False)
+        if id(evicted) not in _CLIENT_LEASES:
+            await _close_clients(evicted)
+    return clients
+
+async def _release_clients(clients: Tuple[OpenAI, OpenAIEmbedding]):
+    """Return a client lease, closing the clients if they were evicted while in use"""
+    remaining = _CLIENT_LEASES.pop(id(clients)) - 1
+    if remaining:
+        _CLIENT_LEASES[id(clients)] = remaining
+    elif not any(cached is clients for cached in _CLIENTS.values()):
+        await _close_clients(clients)
+
+async def _close_clients(clients: Tuple[OpenAI, OpenAIEmbedding]):
+    """Close the HTTP connection pools held by an LLM and embedding client pair"""
+    for model in clients:
+        # LlamaIndex creates the underlying openai SDK clients lazily and keeps them private
+        try:
+            client = getattr(model, "_client", None)
+            if client is not None:
+                client.close()
+            aclient = getattr(model, "_aclient", None)
+            if aclient is not None:
+                await aclient.close()
+        except Exception:
+            # A failed close must not fail the request that triggered the eviction
+            logger.exception("Failed to close evicted OpenAI clients")
+
+def _cache_path(cache_dir: str, video_id: str, suffix: str = "") -> str:
+    """Path of a video's cache entry; rejects IDs that could escape the cache directory"""
+    if not VIDEO_ID_FORMAT.fullmatch(video_id):
+        raise ValueError(f"Invalid video ID: {video_id!r}")
+    return os.path.join(cache_dir, f"{video_id}{suffix}")
+
+def _atomic_write_text(path: str, text: str):
+    """Write a file so concurrent readers never see it partially written"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, suffix=".tmp", delete=False) as f:
+        f.write(text)
+        temp_path = f.name
+    try:
+        os.replace(temp_path, path)
+    except OSError:
+        os.unlink(temp_path)
+        raise
+
+async def get_transcript(video_id: str) -> str:
+    """Fetch transcript text for a video, reading from the disk cache when available"""
+    cache_path = _cache_path(TRANSCRIPT_CACHE_DIR, video_id, ".txt")
+    if os.path.exists(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    # youtube-transcript-api is synchronous, so keep it off the event loop
+    transcript_list = await asyncio.to_thread(
+        YouTubeTranscriptApi.get_transcript, video_id, languages=["en","hi","ml"]
+    )
+    transcript_text = " ".join([entry['text'] for entry in transcript_list])
+
+    _atomic_write_text(cache_path, transcript_text)
+    return transcript_text
+
+@functools.lru_cache(maxsize=None)
+def _tokenizer():
+    """Load the tiktoken encoding on first use, since it may be downloaded"""
+    return tiktoken.encoding_for_model(LLM_MODEL)
+
+def _count_tokens(text: str) -> int:
+    """Count LLM tokens in a text"""
+    return len(_tokenizer().encode(text))
+
+async def get_transcript_token_count(video_id: str, transcript_text: str) -> int:
+    """Token count of a video's transcript, cached next to the transcript itself"""
+    cache_path = _cache_path(TRANSCRIPT_CACHE_DIR, video_id, ".tokens")
+    if os.path.exists(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return int(f.read())
+
+    # Encoding a long transcript is CPU-bound, so keep it off the event loop
+    token_count = await asyncio.to_thread(_count_tokens, transcript_text)
+    _atomic_write_text(cache_path, str(token_count))
+    return token_count
+
+def _load_index(persist_dir: str, embed_model: OpenAIEmbedding):
+    """Load a persisted FAISS-backed vector index"""
+    vector_store = FaissVectorStore.from_persist_dir(persist_dir)
+    storage_context = StorageContext.from_defaults(vector_store=vector_store, persist_dir=persist_dir)
+    return load_index_from_storage(storage_context, embed_model=embed_model)
+
+def _build_index(video_id: str, transcript_text: str, persist_dir: str, embed_model: OpenAIEmbedding):
+    """Embed a transcript into a new FAISS-backed vector index and persist it"""
+    documents = [Document(text=transcript_text, metadata={"video_id": video_id})]
+
+    # Build vector index backed by FAISS (inner product on normalized OpenAI embeddings)
+    vector_store = FaissVectorStore(faiss_index=faiss.IndexFlatIP(EMBED_DIM))
+    storage_context = StorageContext.from_defaults(vector_store=vector_store)
+    index = VectorStoreIndex.from_documents(documents, storage_context=storage_context, embed_model=embed_model)
+
+    # Persist into a scratch directory and move it into place, so a partially
+    # written index is never mistaken for a cache hit.
+    # FaissVectorStore persists its index with faiss.write_index
+    parent_dir = os.path.dirname(persist_dir)
+    os.makedirs(parent_dir, exist_ok=True)
+    temp_dir = tempfile.mkdtemp(dir=parent_dir, prefix=".tmp-")
+    try:
+        index.storage_context.persist(persist_dir=temp_dir)
+        os.replace(temp_dir, persist_dir)
+    except OSError:
+        # Another worker persisted the same index first
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return index
+
+async def _get_or_build_index(video_id: str, transcript_text: str, embed_model: OpenAIEmbedding):
+    """Load the persisted vector index for a video, building and persisting it on a miss"""
+    # Indexes are only reusable with the embedding model that produced them
+    persist_dir = _cache_path(os.path.join(INDEX_CACHE_DIR, embed_model.model_name), video_id)
+    if os.path.isdir(persist_dir):
+        try:
+            return await asyncio.to_thread(_load_index, persist_dir, embed_model)
+        except Exception:
+            # Unreadable entry: drop it and rebuild
+            shutil.rmtree(persist_dir, ignore_errors=True)
+
+    return await asyncio.to_thread(_build_index, video_id, transcript_text, persist_dir, embed_model)
+
+async def _get_query_engine(video_id: str, llm: OpenAI, embed_model: OpenAIEmbedding, streaming: bool = False):
+    """Build a query engine over a video's transcript"""
+    transcript_text = await get_transcript(video_id)
+
+    # Short transcripts fit in the prompt whole, so skip embedding and retrieval entirely
+    if await get_transcript_token_count(video_id, transcript_text) <= FULL_CONTEXT_TOKEN_LIMIT:
+        documents = [Document(text=transcript_text, metadata={"video_id": video_id})]
+        index = SummaryIndex.from_documents(documents)
+        return index.as_query_engine(llm=llm, response_mode="compact", streaming=streaming)
+
+    index = await _get_or_build_index(video_id, transcript_text, embed_model)
+    return index.as_query_engine(
+        llm=llm, similarity_top_k=SIMILARITY_TOP_K, response_mode="compact", streaming=streaming
+    )
+
+def _http_error(e: Exception, error_label: str) -> HTTPException:
+    """Map an upstream failure to an HTTP error, separating client errors from server errors"""
+    message = f"{error_label}: {str(e)}"
+    if isinstance(e, (VideoUnavailable, InvalidVideoId, TranscriptsDisabled, NoTranscriptFound)):
+        return HTTPException(status_code=404, detail=message)
+    if isinstance(e, YOUTUBE_THROTTLE_ERRORS):
+        # YouTube is throttling this server, not the client
+        return HTTPException(status_code=503, detail=message)
+    if isinstance(e, CouldNotRetrieveTranscript):
+        # YouTubeRequestFailed and other upstream failures
+        return HTTPException(status_code=502, detail=message)
+    if isinstance(e, openai.AuthenticationError):
+        return HTTPException(status_code=401, detail=message)
+    if isinstance(e, openai.RateLimitError):
+        retry_after = e.response.headers.get("retry-after") if e.response is not None else None
+        headers = {"Retry-After": retry_after} if retry_after else None
+        return HTTPException(status_code=429, detail=message, headers=headers)
+    if isinstance(e, openai.APIError):
+        return HTTPException(status_code=502, detail=message)
+    return HTTPException(status_code=500, detail=message)
+
+def _response_cache_path(video_id: str, prompt: str) -> str:
+    """Content-addressed cache path for an LLM answer to a prompt about a video"""
+    key = hashlib.sha256(f"{video_id}\0{LLM_MODEL}\0{prompt}".encode("utf-8")).hexdigest()
+    return os.path.join(RESPONSE_CACHE_DIR, f"{key}.txt")
+
+def _read_cached_response(video_id: str, prompt: str) -> Optional[str]:
+    """Return a previously generated answer, or None on a cache miss"""
+    cache_path = _response_cache_path(video_id, prompt)
+    if not os.path.exists(cache_path):
+        return None
+    with open(cache_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+def _write_cached_response(video_id: str, prompt: str, response_text: str):
+    """Store a generated answer in the response cache"""
+    _atomic_write_text(_response_cache_path(video_id, prompt), response_text)
+
+async def _generate(request: YouTubeRequest, prompts: List[str]) -> Tuple[str, List[str]]:
+    """Answer prompts about a video, serving repeats from the response cache"""
+    video_id = _require_video_id(request.video_url)
+
+    answers = [_read_cached_response(video_id, prompt) for prompt in prompts]
+    missing = [i for i, answer in enumerate(answers) if answer is None]
+    if missing:
+        clients = await _acquire_clients(request.api_key)
+        try:
+            query_engine = await _get_query_engine(video_id, *clients)
+            responses = await asyncio.gather(*(query_engine.aquery(prompts[i]) for i in missing))
+        finally:
+            await _release_clients(clients)
+        for i, response in zip(missing, responses):
+            answers[i] = str(response)
+            _write_cached_response(video_id, prompts[i], answers[i])
+    return video_id, answers
+
+def _sse_frame(data: str, event: Optional[str] = None) -> str:
+    """Format one server-sent event"""
+    # Multi-line data needs a data field per line to survive SSE framing
+    lines = [f"event: {event}\n"] if event else []
+    lines += [f"data: {line}\n" for line in data.split("\n")]
+    return "".join(lines) + "\n"
+
+async def _sse_events(token_gen, error_label: str = "Error streaming response", on_complete=None, on_close=None):
+    """Frame streamed LLM tokens as server-sent events"""
+    tokens = []
+    try:
+        # The LLM token generator blocks, so pull from it in the threadpool
+        async for token in iterate_in_threadpool(token_gen):
+            tokens.append(token)
+            yield _sse_frame(token)
+        if on_complete is not None:
+            on_complete("".join(tokens))
+        yield _sse_frame("", event="done")
+    except Exception as e:
+        # Headers are already sent, so report failures in-band rather than
+        # leaving a truncated stream that looks like a short answer
+        yield _sse_frame(_http_error(e, error_label).detail, event="error")
+    finally:
+        if on_close is not None:
+            await on_close()
+
+async def _stream_query(request: YouTubeRequest, prompt: str, error_label: str):
+    """Run a prompt against the video's index and stream the answer as server-sent events"""
+    try:
+        video_id = _require_video_id(request.video_url)
+
+        # Replay a cached answer as a single event
+        cached = _read_cached_response(video_id, prompt)
+        if cached is not None:
+            return StreamingResponse(_sse_events([cached]), media_type="text/event-stream")
+
+        clients = await _acquire_clients(request.api_key)
+        try:
+            query_engine = await _get_query_engine(video_id, *clients, streaming=True)
+            # Retrieval and the start of generation are blocking, so run them off the event loop
+            streaming_response = await asyncio.to_thread(query_engine.query, prompt)
+        except BaseException:
+            await _release_clients(clients)
+            raise
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise _http_error(e, error_label)
+
+    # Cache the full answer once the stream has finished; the clients stay
+    # leased until the stream ends, whether it completes or fails
+    events = _sse_events(
+        streaming_response.response_gen,
+        error_label,
+        on_complete=lambda text: _write_cached_response(video_id, prompt, text),
+        on_close=lambda: _release_clients(clients),
+    )
+    return StreamingResponse(events, media_type="text/event-stream")
 
 # API Endpoints
 @app.get("/")
@@ -89,13 +472,10 @@ async def extract_transcript(request: YouTubeRequest):
     """Extract transcript from YouTube video"""
     try:
         # Extract video ID
-        video_id = extract_video_id(request.video_url)
-        if not video_id:
-            raise HTTPException(status_code=400, detail="Invalid YouTube URL")
+        video_id = _require_video_id(request.video_url)
         
         # Get transcript
-        transcript_list = YouTubeTranscriptApi.get_transcript(video_id,languages=["en","hi","ml"])
-        transcript_text = " ".join([entry['text'] for entry in transcript_list])
+        transcript_text = await get_transcript(video_id)
         
         return TranscriptResponse(
             transcript=transcript_text,
@@ -104,201 +484,78 @@ async def extract_transcript(request: YouTubeRequest):
             message="Transcript extracted successfully"
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
-        return TranscriptResponse(
-            transcript="",
-            video_id="",
-            success=False,
-            message=f"Error extracting transcript: {str(e)}"
-        )
+        raise _http_error(e, "Error extracting transcript")
 
 @app.post("/generate-summary", response_model=SummaryResponse)
 async def generate_summary(request: YouTubeRequest):
     """Generate summary from transcript using RAG"""
     try:
-        # Setup LlamaIndex
-        setup_llama_index(request.api_key)
+        # Generate summary
+        _, (summary,) = await _generate(request, [SUMMARY_PROMPT])
         
-        # Extract transcript first
-        video_id = extract_video_id(request.video_url)
-        if not video_id:
-            raise HTTPException(status_code=400, detail="Invalid YouTube URL")
-        
-        transcript_list = YouTubeTranscriptApi.get_transcript(video_id,languages=["en","hi","ml"])
-        transcript_text = " ".join([entry['text'] for entry in transcript_list])
-        
-        # Create temporary file for transcript
-        with tempfile.NamedTemporaryFile(mode="w+", delete=False, suffix=".txt", encoding="utf-8") as f:
-            f.write(transcript_text)
-            temp_path = f.name
-        
-        try:
-            # Load document and create index
-            reader = SimpleDirectoryReader(input_files=[temp_path])
-            documents = reader.load_data()
-            
-            # Build vector index
-            index = VectorStoreIndex.from_documents(documents)
-            query_engine = index.as_query_engine()
-            
-            # Generate summary
-            response = query_engine.query(
-                "Provide a comprehensive summary of this content in 3-4 paragraphs, "
-                "highlighting the main topics, key insights, and important takeaways."
-            )
-            
-            return SummaryResponse(
-                summary=str(response),
-                success=True,
-                message="Summary generated successfully"
-            )
-            
-        finally:
-            # Clean up temp file
-            os.unlink(temp_path)
-    
-    except Exception as e:
         return SummaryResponse(
-            summary="",
-            success=False,
-            message=f"Error generating summary: {str(e)}"
+            summary=summary,
+            success=True,
+            message="Summary generated successfully"
         )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise _http_error(e, "Error generating summary")
 
 @app.post("/generate-blog", response_model=BlogResponse)
 async def generate_blog(request: YouTubeRequest):
     """Generate blog post from transcript using RAG"""
     try:
-        # Setup LlamaIndex
-        setup_llama_index(request.api_key)
-        
-        # Extract transcript
-        video_id = extract_video_id(request.video_url)
-        if not video_id:
-            raise HTTPException(status_code=400, detail="Invalid YouTube URL")
+        # Generate blog post
+        _, (blog_content,) = await _generate(request, [BLOG_PROMPT])
         
-        transcript_list = YouTubeTranscriptApi.get_transcript(video_id,languages=["en","hi","ml"])
-        transcript_text = " ".join([entry['text'] for entry in transcript_list])
-        
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(mode="w+", delete=False, suffix=".txt", encoding="utf-8") as f:
-            f.write(transcript_text)
-            temp_path = f.name
-        
-        try:
-            # Load document and create index
-            reader = SimpleDirectoryReader(input_files=[temp_path])
-            documents = reader.load_data()
-            
-            # Build vector index
-            index = VectorStoreIndex.from_documents(documents)
-            query_engine = index.as_query_engine()
-            
-            # Generate blog post
-            blog_prompt = """
-            Write a comprehensive, engaging blog post based on this content. 
-            Structure it with:
-            1. An engaging title and introduction
-            2. Main sections with clear headings
-            3. Key insights and explanations
-            4. Practical examples or applications
-            5. A compelling conclusion
-            
-            Make it informative, well-structured, and engaging for readers.
-            Use HTML formatting for headings (<h3>) and paragraphs (<p>).
-            """
-            
-            response = query_engine.query(blog_prompt)
-            
-            return BlogResponse(
-                blog_content=str(response),
-                success=True,
-                message="Blog post generated successfully"
-            )
-            
-        finally:
-            # Clean up temp file
-            os.unlink(temp_path)
-    
-    except Exception as e:
         return BlogResponse(
-            blog_content="",
-            success=False,
-            message=f"Error generating blog: {str(e)}"
+            blog_content=blog_content,
+            success=True,
+            message="Blog post generated successfully"
         )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise _http_error(e, "Error generating blog")
+
+@app.post("/generate-summary/stream")
+async def generate_summary_stream(request: YouTubeRequest):
+    """Stream summary tokens as server-sent events"""
+    return await _stream_query(request, SUMMARY_PROMPT, "Error generating summary")
+
+@app.post("/generate-blog/stream")
+async def generate_blog_stream(request: YouTubeRequest):
+    """Stream blog post tokens as server-sent events"""
+    return await _stream_query(request, BLOG_PROMPT, "Error generating blog")
 
 @app.post("/process-complete", response_model=ProcessResponse)
 async def process_complete(request: YouTubeRequest):
     """Complete processing pipeline: transcript -> summary -> blog"""
     try:
-        # Setup LlamaIndex
-        setup_llama_index(request.api_key)
-        
-        # Extract transcript
-        video_id = extract_video_id(request.video_url)
-        if not video_id:
-            raise HTTPException(status_code=400, detail="Invalid YouTube URL")
-        
-        transcript_list = YouTubeTranscriptApi.get_transcript(video_id,languages=["en","hi","ml"])
-        transcript_text = " ".join([entry['text'] for entry in transcript_list])
-        
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(mode="w+", delete=False, suffix=".txt", encoding="utf-8") as f:
-            f.write(transcript_text)
-            temp_path = f.name
+        # Generate summary and blog post concurrently
+        video_id, (summary, blog_content) = await _generate(request, [SUMMARY_PROMPT, BLOG_PROMPT])
+        transcript_text = await get_transcript(video_id)
         
-        try:
-            # Load document and create index
-            reader = SimpleDirectoryReader(input_files=[temp_path])
-            documents = reader.load_data()
-            
-            # Build vector index
-            index = VectorStoreIndex.from_documents(documents)
-            query_engine = index.as_query_engine()
-            
-            # Generate summary
-            summary_response = query_engine.query(
-                "Provide a comprehensive summary of this content in 3-4 paragraphs, "
-                "highlighting the main topics, key insights, and important takeaways."
-            )
-            
-            # Generate blog post
-            blog_prompt = """
-            Write a comprehensive, engaging blog post based on this content. 
-            Structure it with:
-            1. An engaging title and introduction
-            2. Main sections with clear headings
-            3. Key insights and explanations
-            4. Practical examples or applications
-            5. A compelling conclusion
-            
-            Make it informative, well-structured, and engaging for readers.
-            Use HTML formatting for headings (<h3>) and paragraphs (<p>).
-            """
-            
-            blog_response = query_engine.query(blog_prompt)
-            
-            return ProcessResponse(
-                transcript=transcript_text,
-                summary=str(summary_response),
-                blog_content=str(blog_response),
-                video_id=video_id,
-                success=True,
-                message="Complete processing successful"
-            )
-            
-        finally:
-            # Clean up temp file
-            os.unlink(temp_path)
-    
-    except Exception as e:
         return ProcessResponse(
-            transcript="",
-            summary="",
-            blog_content="",
-            video_id="",
-            success=False,
-            message=f"Error in complete processing: {str(e)}"
+            transcript=transcript_text,
+            summary=summary,
+            blog_content=blog_content,
+            video_id=video_id,
+            success=True,
+            message="Complete processing successful"
         )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise _http_error(e, "Error in complete processing")
 
 # Health check endpoint
 @app.get("/health")
@@ -308,4 +565,15 @@ async def health_check():
 # Run the server
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Multiple workers need an import string; each worker keeps its own client cache.
+    # loop/http "auto" pick uvloop and httptools when installed via uvicorn[standard].
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        loop="auto",
+        http="auto",
+        limit_concurrency=int(os.environ.get("LIMIT_CONCURRENCY", 100)),
+        backlog=int(os.environ.get("BACKLOG", 2048)),
+    )
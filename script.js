@@ -16,7 +16,8 @@ class YouTubeRAGAPI {
             });
 
             if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
+                const body = await response.json().catch(() => ({}));
+                throw new Error(body.detail || `HTTP error! status: ${response.status}`);
             }
 
             return await response.json();